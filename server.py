@@ -16,19 +16,34 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import functools
 import json
 import os
-import random
 import re
-import string
+import secrets
+import selectors
+import socket
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from http.server import HTTPServer, BaseHTTPRequestHandler
-from socketserver import ThreadingMixIn
 from pathlib import Path
+from typing import Callable
 from urllib.parse import urlparse, unquote
 
+try:
+    # Optional: OS-level file notifications (inotify / FSEvents / ReadDirectoryChangesW)
+    from watchfiles import watch
+except ImportError:
+    watch = None
+
+try:
+    # Optional: Rust-backed JSON encoder
+    import orjson
+except ImportError:
+    orjson = None
+
 # ── Configuration ────────────────────────────────────────────
 
 CLAUDE_DIR = Path.home() / ".claude"
@@ -36,101 +51,486 @@ PLANS_DIR = CLAUDE_DIR / "plans"
 COMMENTS_DIR = CLAUDE_DIR / "plan-reviews"
 INDEX_HTML = Path(__file__).parent / "index.html"
 
+# ── JSON ─────────────────────────────────────────────────────
+
+def json_bytes(data, indent: bool = False) -> bytes:
+    """Encode data as UTF-8 JSON, using orjson when it is installed.
+
+    Falls back to the stdlib for what orjson rejects (e.g. ints over 64 bits).
+    The two encoders format some floats differently (1e20 vs 1e+20).
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+        except TypeError:
+            pass
+    return json.dumps(data, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
 # ── SSE Client Registry ─────────────────────────────────────
 
-sse_clients: list = []
+class SSEClient:
+    """An open event stream: its non-blocking socket and the bytes still to be sent."""
+
+    __slots__ = ("sock", "reactor", "buffer", "events")
+
+    def __init__(self, sock: socket.socket, reactor: SSEReactor):
+        self.sock = sock
+        self.reactor = reactor
+        self.buffer = bytearray()
+        self.events = 0  # selector interest the reactor last registered
+
+
+# Immutable tuple of SSEClients, swapped under sse_lock; sse_lock also guards
+# every client's buffer. Only the owning SSEReactor writes to or closes a socket.
+sse_clients: tuple = ()
 sse_lock = threading.Lock()
 
+# A client that has fallen this far behind is dropped instead of buffered further
+SSE_MAX_BUFFER = 1 << 20
 
-def broadcast_sse(event: str, data: dict):
-    msg = f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def add_sse_client(client: SSEClient):
+    global sse_clients
+    with sse_lock:
+        sse_clients = sse_clients + (client,)
+
+
+def remove_sse_clients(*clients: SSEClient):
+    global sse_clients
+    with sse_lock:
+        sse_clients = tuple(c for c in sse_clients if c not in clients)
+
+
+def send_to_sse_clients(msg: bytes):
+    """Queue msg for every client; the reactors do the actual writes."""
+    global sse_clients
+    reactors = set()
     with sse_lock:
-        dead = []
-        for wfile in sse_clients:
+        overflowed = []
+        for client in sse_clients:
+            if len(client.buffer) + len(msg) > SSE_MAX_BUFFER:
+                overflowed.append(client)
+            else:
+                client.buffer += msg
+            reactors.add(client.reactor)
+        if overflowed:
+            # Unregistered clients are closed by their reactor on its next pass
+            sse_clients = tuple(c for c in sse_clients if c not in overflowed)
+    for reactor in reactors:
+        reactor.wake()
+
+
+def broadcast_sse(event: str, data: dict):
+    send_to_sse_clients(b"event: " + event.encode() + b"\ndata: " + json_bytes(data) + b"\n\n")
+
+
+class SSEReactor(threading.Thread):
+    """Services every open SSE connection from a single thread.
+
+    Waits on all client sockets at once: a readable socket means the client
+    disconnected (SSE clients never send after the request), and a writable
+    one takes more of its queued events. Broadcasts only append to buffers,
+    so a client that stops reading never holds up the request that sent them.
+    """
+
+    def __init__(self, keepalive: float = 30.0):
+        super().__init__(daemon=True)
+        self.keepalive = keepalive
+        self._selector = selectors.DefaultSelector()
+        self._clients: set[SSEClient] = set()
+        self._pending: list[SSEClient] = []
+        self._pending_lock = threading.Lock()
+        # Lets other threads interrupt select() to register clients or flush buffers
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ)
+
+    def add_client(self, sock: socket.socket):
+        sock.setblocking(False)
+        client = SSEClient(sock, self)
+        with self._pending_lock:
+            self._pending.append(client)
+        add_sse_client(client)
+        self.wake()
+
+    def wake(self):
+        try:
+            self._wake_w.send(b"\0")
+        except BlockingIOError:
+            pass  # A wakeup is already pending
+
+    def run(self):
+        next_keepalive = time.monotonic() + self.keepalive
+        while True:
+            timeout = max(0.0, next_keepalive - time.monotonic())
+            for key, mask in self._selector.select(timeout):
+                if key.fileobj is self._wake_r:
+                    try:
+                        self._wake_r.recv(4096)
+                    except BlockingIOError:
+                        pass
+                elif mask & selectors.EVENT_READ:
+                    self._drop(key.data)
+                else:
+                    self._flush(key.data)
+            if time.monotonic() >= next_keepalive:
+                send_to_sse_clients(b": keepalive\n\n")
+                next_keepalive = time.monotonic() + self.keepalive
+            self._update()
+
+    def _update(self):
+        """Register new clients, drop unregistered ones, and flush queued events."""
+        with self._pending_lock:
+            pending, self._pending = self._pending, []
+        for client in pending:
+            self._clients.add(client)
             try:
-                wfile.write(msg.encode())
-                wfile.flush()
-            except Exception:
-                dead.append(wfile)
-        for w in dead:
-            sse_clients.remove(w)
+                self._selector.register(client.sock, selectors.EVENT_READ, client)
+                client.events = selectors.EVENT_READ
+            except (ValueError, OSError):
+                # Already closed before we got to it
+                self._drop(client)
+        with sse_lock:
+            live = set(sse_clients)
+        for client in list(self._clients):
+            if client not in live:
+                self._drop(client)
+            elif client.buffer:
+                self._flush(client)
+
+    def _flush(self, client: SSEClient):
+        with sse_lock:
+            try:
+                sent = client.sock.send(client.buffer)
+            except (BlockingIOError, InterruptedError):
+                sent = 0
+            except OSError:
+                sent = -1
+            else:
+                del client.buffer[:sent]
+            remaining = bool(client.buffer)
+        if sent < 0:
+            self._drop(client)
+            return
+        # Only ask for writability while there's something left to write
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if remaining else 0)
+        if events != client.events:
+            self._selector.modify(client.sock, events, client)
+            client.events = events
+
+    def _drop(self, client: SSEClient):
+        remove_sse_clients(client)
+        if client not in self._clients:
+            return
+        self._clients.discard(client)
+        if client.events:
+            self._selector.unregister(client.sock)
+            client.events = 0
+        client.sock.close()
 
 
-# ── File Watcher (polling, no dependencies) ──────────────────
+# ── File Watcher ─────────────────────────────────────────────
 
 class FileWatcher(threading.Thread):
-    """Polls directories for .md file changes and broadcasts SSE events."""
+    """Watches directories for .md file changes and broadcasts SSE events.
+
+    Uses watchfiles (kernel notifications) when it is installed, otherwise
+    falls back to polling. Set PLAN_REVIEWER_POLL=1 to force polling, e.g. for
+    NFS/CIFS mounts where inotify is unreliable.
+    """
 
-    def __init__(self, dirs: list[Path], interval: float = 1.0):
+    def __init__(self, dirs: list[Path], interval: float = 1.0, poll: bool | None = None,
+                 on_change: Callable[[str, str], None] | None = None):
         super().__init__(daemon=True)
         self.dirs = dirs
         self.interval = interval
-        self._snapshots: dict[Path, dict[str, float]] = {}
+        self.on_change = on_change
+        if poll is None:
+            poll = watch is None or os.environ.get("PLAN_REVIEWER_POLL", "0") not in ("", "0")
+        self.poll = poll
+        self._stop_event = threading.Event()
+        # Last-seen {name: (mtime, size)} per directory, also served to list_plans()
+        self._lock = threading.RLock()
+        self._snapshots: dict[Path, dict[str, tuple[float, int]]] = {}
+        # (st_ino, st_mtime_ns) of each directory, taken just before its snapshot was
+        # last brought up to date; a mismatch means the snapshot may be stale
+        self._dir_keys: dict[Path, tuple[int, int] | None] = {}
         for d in dirs:
+            self._dir_keys[d] = self._dir_key(d)
             self._snapshots[d] = self._scan(d)
 
+    def stop(self):
+        self._stop_event.set()
+
+    def snapshot(self, directory: Path) -> tuple[dict[str, tuple[float, int]], tuple[int, int] | None] | None:
+        """Return a copy of the last-seen {name: (mtime, size)} for a watched directory,
+        along with the directory's (st_ino, st_mtime_ns) at that time."""
+        with self._lock:
+            snap = self._snapshots.get(directory)
+            if snap is None:
+                return None
+            return dict(snap), self._dir_keys.get(directory)
+
     @staticmethod
-    def _scan(directory: Path) -> dict[str, float]:
+    def _dir_key(directory: Path) -> tuple[int, int] | None:
+        try:
+            st = directory.stat()
+        except OSError:
+            return None
+        return st.st_ino, st.st_mtime_ns
+
+    def _publish(self, changes: list[dict]):
+        """Broadcast one batched SSE event for everything seen in a watch cycle."""
+        if not changes:
+            return
+        if self.on_change:
+            for c in changes:
+                self.on_change(c["dir"], c["file"])
+        broadcast_sse("file-changes-batch", {"changes": changes})
+
+    @staticmethod
+    def _scan(directory: Path) -> dict[str, tuple[float, int]]:
         result = {}
-        if directory.is_dir():
-            for f in directory.iterdir():
-                if f.suffix == ".md":
-                    try:
-                        result[f.name] = f.stat().st_mtime
-                    except OSError:
-                        pass
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.name.endswith(".md"):
+                        try:
+                            st = entry.stat()
+                            result[entry.name] = (st.st_mtime, st.st_size)
+                        except OSError:
+                            pass
+        except OSError:
+            pass
         return result
 
     def run(self):
-        while True:
-            time.sleep(self.interval)
-            for d in self.dirs:
-                current = self._scan(d)
-                prev = self._snapshots.get(d, {})
-                # Detect new or modified files
-                for name, mtime in current.items():
-                    if name not in prev or prev[name] != mtime:
-                        broadcast_sse("file-change", {
-                            "dir": d.name, "file": name, "event": "change"
-                        })
-                # Detect deleted files
-                for name in set(prev) - set(current):
-                    broadcast_sse("file-change", {
-                        "dir": d.name, "file": name, "event": "delete"
-                    })
+        if self.poll:
+            self._run_polling()
+        else:
+            self._run_watchfiles()
+
+    def _run_watchfiles(self):
+        try:
+            while not self._stop_event.is_set():
+                dir_ids = self._dir_ids()
+                if None in dir_ids.values():
+                    # A watched directory is gone; wait for it to be recreated
+                    self._stop_event.wait(self.interval)
+                    continue
+                # Catch up on anything that changed while (re)starting the watch
+                self._poll_once()
+                self._watch(dir_ids)
+        except Exception as e:
+            print(f"⚠️  File watching failed ({e}); falling back to polling")
+            self._run_polling()
+
+    def _dir_ids(self) -> dict[Path, int | None]:
+        ids = {}
+        for d in self.dirs:
+            try:
+                ids[d] = d.stat().st_ino
+            except OSError:
+                ids[d] = None
+        return ids
+
+    def _watch(self, dir_ids: dict[Path, int | None]):
+        """Run watchfiles until stop() is called or a watched directory is replaced."""
+        dirs_by_name = {d.name: d for d in self.dirs}
+        # Blocks in the kernel until something changes. Also wakes every few seconds
+        # to check the directories themselves: inotify stays on a deleted inode.
+        for changes in watch(
+            *self.dirs,
+            watch_filter=lambda _change, path: path.endswith(".md"),
+            recursive=False,
+            debounce=50,
+            rust_timeout=5000,
+            yield_on_timeout=True,
+            stop_event=self._stop_event,
+        ):
+            if self._dir_ids() != dir_ids:
+                return
+            dir_keys = {d: self._dir_key(d) for d in self.dirs}
+            # watchfiles already coalesces writes within the debounce window; one path
+            # may still be reported several times, so take its final state from disk
+            batch = []
+            for path in sorted({path for _change, path in changes}):
+                p = Path(path)
+                d = dirs_by_name.get(p.parent.name)
+                try:
+                    st = os.stat(path)
+                    entry, event = (st.st_mtime, st.st_size), "change"
+                except OSError:
+                    entry, event = None, "delete"
+                if d is not None:
+                    with self._lock:
+                        snap = self._snapshots[d]
+                        if entry is None:
+                            snap.pop(p.name, None)
+                        else:
+                            snap[p.name] = entry
+                batch.append({"dir": p.parent.name, "file": p.name, "event": event})
+            with self._lock:
+                self._dir_keys.update(dir_keys)
+            self._publish(batch)
+
+    def _run_polling(self):
+        while not self._stop_event.wait(self.interval):
+            self._poll_once()
+
+    def _poll_once(self):
+        """Rescan every directory and publish the differences from the last snapshot."""
+        batch = []
+        for d in self.dirs:
+            dir_key = self._dir_key(d)
+            current = self._scan(d)
+            prev = self._snapshots.get(d, {})
+            # Detect new or modified files
+            for name, entry in current.items():
+                if name not in prev or prev[name] != entry:
+                    batch.append({"dir": d.name, "file": name, "event": "change"})
+            # Detect deleted files
+            for name in set(prev) - set(current):
+                batch.append({"dir": d.name, "file": name, "event": "delete"})
+            with self._lock:
                 self._snapshots[d] = current
+                self._dir_keys[d] = dir_key
+        self._publish(batch)
+
+
+# Set by main(); list_plans() reads directory snapshots from it
+WATCHER: FileWatcher | None = None
 
 
 # ── Plan & Comment Operations ────────────────────────────────
 
+_TYPE_EMOJI = {
+    "comment": "\U0001f4ac",
+    "suggestion": "\U0001f4a1",
+    "question": "\u2753",
+    "approve": "\u2705",
+    "reject": "\u274c",
+}
+_EMOJI_TYPE = {emoji: comment_type for comment_type, emoji in _TYPE_EMOJI.items()}
+_EMOJI_ALTERNATION = "|".join(re.escape(e) for e in _EMOJI_TYPE)
+
+# Comment blocks are matched line by line:
+#   ### {emoji} TYPE [(on: "...") | (re: "...")] [[Line N]]
+#   [blank line]
+#   > quoted text (one or more lines)
+#   blank line
+#   _— Reviewer, YYYY/MM/DD HH:MM_
+_COMMENT_HEADER_PREFIXES = tuple(f"### {e} " for e in _EMOJI_TYPE)
+_COMMENT_HEADER_RE = re.compile(
+    r'### (' + _EMOJI_ALTERNATION + r') (\w+)'
+    r'(?: \(on: "(.+?)"\))?'
+    r'(?: \(re: "(.+?)"\))?'
+    r'(?: \[Line (\d+)\])?'
+)
+_TS_RE = re.compile(r'_\u2014 Reviewer, (\d{4}/\d{2}/\d{2} \d{2}:\d{2})_')
+
+
 def list_plans() -> list[dict]:
+    """List plan metadata for the sidebar; content is fetched via get_plan()."""
+    # The watcher already tracks every plan's mtime/size. Fall back to scanning
+    # when it isn't running or PLANS_DIR changed (or was replaced) since its snapshot.
+    snapshot = None
+    if WATCHER is not None and WATCHER.is_alive():
+        cached = WATCHER.snapshot(PLANS_DIR)
+        if cached is not None and cached[1] is not None and cached[1] == FileWatcher._dir_key(PLANS_DIR):
+            snapshot = cached[0]
+    if snapshot is None:
+        snapshot = FileWatcher._scan(PLANS_DIR)
     plans = []
-    if PLANS_DIR.is_dir():
-        for f in PLANS_DIR.iterdir():
-            if f.suffix == ".md":
-                stat = f.stat()
-                comments = load_comments(f.name)
-                plans.append({
-                    "id": f.stem,
-                    "name": f.name,
-                    "path": str(f),
-                    "content": f.read_text(encoding="utf-8", errors="replace"),
-                    "modified": datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc).isoformat(),
-                    "size": stat.st_size,
-                    "commentCount": len(comments),
-                    "source": "plans",
-                })
+    for name, (mtime, size) in snapshot.items():
+        comments = load_comments(name)
+        plans.append({
+            "id": name[:-3],
+            "name": name,
+            "path": str(PLANS_DIR / name),
+            "modified": datetime.fromtimestamp(mtime, tz=timezone.utc).isoformat(),
+            "size": size,
+            "commentCount": len(comments),
+            "source": "plans",
+        })
     plans.sort(key=lambda p: p["modified"], reverse=True)
     return plans
 
 
+# plan_id -> (plan mtime_ns, comments mtime_ns, synced comments)
+_sync_cache: dict[str, tuple[int, int, list[dict]]] = {}
+
+
+def invalidate_sync_cache(plan_id: str | None = None):
+    """Drop cached sync results for one plan, or for all plans."""
+    if plan_id is None:
+        _sync_cache.clear()
+    else:
+        _sync_cache.pop(plan_id, None)
+
+
+def _mtime_ns(path: Path) -> int:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+def _read_plan(fp: Path) -> tuple[str, os.stat_result, bool]:
+    """Return a plan's decoded content and stat, reusing the cached text if unchanged.
+
+    Newlines are normalized to \\n like Path.read_text() does. The third value
+    is True when that changed anything (the file has \\r), i.e. the text no
+    longer maps byte for byte onto the file.
+    """
+    st = fp.stat()
+    content, had_cr = _read_plan_cached(
+        str(fp), st.st_ino, st.st_mtime_ns, st.st_ctime_ns, st.st_size
+    )
+    return content, st, had_cr
+
+
+@functools.lru_cache(maxsize=32)
+def _read_plan_cached(path: str, ino: int, mtime_ns: int, ctime_ns: int,
+                      size: int) -> tuple[str, bool]:
+    # Everything but path is only part of the cache key. Same-size writes within
+    # one timestamp tick can still collide, so the watcher also clears the cache.
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        chunks = []
+        while True:
+            chunk = os.read(fd, max(size, 4096))
+            if not chunk:
+                break
+            chunks.append(chunk)
+    finally:
+        os.close(fd)
+    data = b"".join(chunks)
+    content = data.decode("utf-8", "replace")
+    had_cr = b"\r" in data
+    if had_cr:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+    return content, had_cr
+
+
 def get_plan(plan_id: str) -> dict | None:
     fp = PLANS_DIR / f"{plan_id}.md"
-    if not fp.exists():
+    try:
+        content, stat, _ = _read_plan(fp)
+    except FileNotFoundError:
         return None
-    stat = fp.stat()
-    content = fp.read_text(encoding="utf-8", errors="replace")
-    comments = sync_comments_with_plan(plan_id, content)
+    comments_mtime = _mtime_ns(comments_file(fp.name))
+
+    # Only re-sync when the plan or its comments JSON changed since last time
+    cached = _sync_cache.get(plan_id)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == comments_mtime:
+        comments = cached[2]
+    else:
+        comments = sync_comments_with_plan(plan_id, content)
+        _sync_cache[plan_id] = (stat.st_mtime_ns, comments_mtime, comments)
+
     return {
         "id": plan_id,
         "name": fp.name,
@@ -157,19 +557,36 @@ def load_comments(plan_filename: str) -> list[dict]:
 
 def save_comments(plan_filename: str, comments: list[dict]):
     cf = comments_file(plan_filename)
-    cf.write_text(json.dumps(comments, indent=2, ensure_ascii=False), encoding="utf-8")
+    data = json_bytes(comments, indent=True)
+    try:
+        if cf.read_bytes() == data:
+            return  # unchanged — skip the write (and the mtime bump)
+    except OSError:
+        pass
+    # Write to a temp file and swap it in so readers never see a partial file
+    tmp = cf.with_name(f"{cf.name}.{threading.get_ident()}.tmp")
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, cf)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def _iso_to_ts(iso: str) -> str:
+    """Format an ISO 8601 timestamp as the "YYYY/MM/DD HH:MM" used in comment blocks."""
+    # Fixed-offset fields can be sliced directly; anything unusual goes through datetime
+    if len(iso) >= 16 and iso[4] == "-" and iso[7] == "-" and iso[13] == ":":
+        return f"{iso[0:4]}/{iso[5:7]}/{iso[8:10]} {iso[11:13]}:{iso[14:16]}"
+    return datetime.fromisoformat(iso).strftime("%Y/%m/%d %H:%M")
 
 
 def build_comment_block(comment: dict) -> str:
     """Reconstruct the markdown block that was injected into the plan file."""
-    type_emoji = {
-        "comment": "\U0001f4ac",
-        "suggestion": "\U0001f4a1",
-        "question": "\u2753",
-        "approve": "\u2705",
-        "reject": "\u274c",
-    }
-    emoji = type_emoji.get(comment.get("type", "comment"), "\U0001f4ac")
+    emoji = _TYPE_EMOJI.get(comment.get("type", "comment"), "\U0001f4ac")
 
     selected_text = comment.get("selectedText", "")
 
@@ -185,51 +602,66 @@ def build_comment_block(comment: dict) -> str:
     quoted_text = "\n> ".join(comment.get("text", "").split("\n"))
     block += f"\n\n> {quoted_text}\n\n"
 
-    ts = datetime.fromisoformat(comment["createdAt"]).strftime("%Y/%m/%d %H:%M")
+    ts = _iso_to_ts(comment["createdAt"])
     block += f"_\u2014 Reviewer, {ts}_\n\n"
     return block
 
 
-def parse_comments_from_plan(plan_id: str, content: str) -> list[dict]:
-    """Parse comment blocks from the plan .md file into structured dicts."""
-    type_by_emoji = {
-        "\U0001f4ac": "comment",
-        "\U0001f4a1": "suggestion",
-        "\u2753": "question",
-        "\u2705": "approve",
-        "\u274c": "reject",
-    }
-
-    # Match comment blocks: ### {emoji} TYPE [optional context]\n[\n]> text\n\n_— Reviewer, timestamp_
-    pattern = (
-        r'### (' + '|'.join(re.escape(e) for e in type_by_emoji) + r') (\w+)'
-        r'(?: \(on: "(.+?)"\))?'
-        r'(?: \(re: "(.+?)"\))?'
-        r'(?: \[Line (\d+)\])?'
-        r'\n\n?((?:>.*\n)+)\n'
-        r'_\u2014 Reviewer, (\d{4}/\d{2}/\d{2} \d{2}:\d{2})_'
+def _fingerprint(comment: dict) -> tuple:
+    """Identify a comment by the fields build_comment_block() renders, without building it."""
+    comment_type = comment.get("type", "comment")
+    selected_text = comment.get("selectedText") or ""
+    line_number = comment.get("lineNumber")
+    return (
+        _TYPE_EMOJI.get(comment_type, "\U0001f4ac"),
+        comment_type.upper(),
+        selected_text[:80] + ("..." if len(selected_text) > 80 else ""),
+        "" if selected_text else str(comment.get("sectionTitle") or ""),
+        str(line_number) if line_number else "",
+        comment.get("text", ""),
+        _iso_to_ts(comment["createdAt"]),
     )
 
+
+def parse_comments_from_plan(plan_id: str, content: str) -> list[dict]:
+    """Parse comment blocks from the plan .md file into structured dicts."""
+    lines = content.split("\n")
+    n = len(lines)
     found = []
-    for m in re.finditer(pattern, content):
+    i = 0
+    while i < n:
+        line = lines[i]
+        i += 1
+        # Fail fast on everything that isn't a comment heading
+        if not line.startswith(_COMMENT_HEADER_PREFIXES):
+            continue
+        m = _COMMENT_HEADER_RE.fullmatch(line)
+        if not m:
+            continue
+
+        j = i
+        if j < n and lines[j] == "":
+            j += 1
+        quote_start = j
+        while j < n and lines[j].startswith(">"):
+            j += 1
+        if j == quote_start or j + 1 >= n or lines[j] != "":
+            continue
+        ts_match = _TS_RE.match(lines[j + 1])
+        if not ts_match:
+            continue
+        quoted = lines[quote_start:j]
+        i = j + 2
+
         emoji = m.group(1)
-        comment_type = type_by_emoji.get(emoji, "comment")
+        comment_type = _EMOJI_TYPE.get(emoji, "comment")
         on_text = m.group(3) or ""
         re_section = m.group(4) or ""
         line_num = int(m.group(5)) if m.group(5) else None
-        raw_quoted = m.group(6)
-        ts_str = m.group(7)
+        ts_str = ts_match.group(1)
 
         # Strip "> " or ">" prefix from each line
-        lines = []
-        for line in raw_quoted.rstrip("\n").split("\n"):
-            if line.startswith("> "):
-                lines.append(line[2:])
-            elif line.startswith(">"):
-                lines.append(line[1:])
-            else:
-                lines.append(line)
-        text = "\n".join(lines)
+        text = "\n".join(q[2:] if q.startswith("> ") else q[1:] for q in quoted)
 
         # Convert timestamp back to ISO format
         dt = datetime.strptime(ts_str, "%Y/%m/%d %H:%M").replace(tzinfo=timezone.utc)
@@ -265,15 +697,14 @@ def sync_comments_with_plan(plan_id: str, content: str) -> list[dict]:
 
     # Direction 2: add plan-file comments that are missing from JSON
     plan_comments = parse_comments_from_plan(plan_id, content)
-    existing_blocks = {build_comment_block(c) for c in comments}
+    existing = {_fingerprint(c) for c in comments}
 
     for pc in plan_comments:
-        # Build a block from the parsed data to check if it already exists in JSON
-        candidate = build_comment_block(pc)
-        if candidate not in existing_blocks:
-            rand = "".join(random.choices(string.ascii_lowercase + string.digits, k=6))
+        candidate = _fingerprint(pc)
+        if candidate not in existing:
+            rand = secrets.token_hex(3)
             new_comment = {
-                "id": f"comment-{int(time.time() * 1000)}-{rand}",
+                "id": f"comment-{time.time_ns() // 1_000_000}-{rand}",
                 "planId": plan_id,
                 "lineNumber": pc.get("lineNumber"),
                 "lineContent": "",
@@ -285,7 +716,7 @@ def sync_comments_with_plan(plan_id: str, content: str) -> list[dict]:
                 "createdAt": pc["createdAt"],
             }
             comments.append(new_comment)
-            existing_blocks.add(candidate)
+            existing.add(candidate)
             changed = True
 
     if changed:
@@ -298,11 +729,11 @@ def add_comment(plan_id: str, comment_data: dict) -> dict:
     plan_filename = f"{plan_id}.md"
     comments = load_comments(plan_filename)
 
-    rand = "".join(random.choices(string.ascii_lowercase + string.digits, k=6))
+    rand = secrets.token_hex(3)
     now = datetime.now(tz=timezone.utc).isoformat()
 
     new_comment = {
-        "id": f"comment-{int(time.time() * 1000)}-{rand}",
+        "id": f"comment-{time.time_ns() // 1_000_000}-{rand}",
         "planId": plan_id,
         "lineNumber": comment_data.get("lineNumber"),
         "lineContent": comment_data.get("lineContent", ""),
@@ -317,6 +748,7 @@ def add_comment(plan_id: str, comment_data: dict) -> dict:
     comments.append(new_comment)
     save_comments(plan_filename, comments)
     inject_comment_into_plan(plan_id, new_comment)
+    invalidate_sync_cache(plan_id)
     broadcast_sse("comment-added", {"planId": plan_id, "comment": new_comment})
     return new_comment
 
@@ -329,6 +761,7 @@ def resolve_comment(plan_id: str, comment_id: str) -> dict | None:
             c["status"] = "resolved"
             c["resolvedAt"] = datetime.now(tz=timezone.utc).isoformat()
             save_comments(plan_filename, comments)
+            invalidate_sync_cache(plan_id)
             return c
     return None
 
@@ -349,6 +782,7 @@ def delete_comment(plan_id: str, comment_id: str) -> bool:
 
     if target:
         remove_comment_from_plan(plan_id, target)
+    invalidate_sync_cache(plan_id)
 
     return True
 
@@ -356,37 +790,52 @@ def delete_comment(plan_id: str, comment_id: str) -> bool:
 def build_comment_removal_pattern(comment: dict) -> re.Pattern:
     """Build a regex that matches the comment block in the plan file,
     tolerating whitespace variations (e.g. \\n vs \\n\\n between heading and text)."""
-    type_emoji = {
-        "comment": "\U0001f4ac",
-        "suggestion": "\U0001f4a1",
-        "question": "\u2753",
-        "approve": "\u2705",
-        "reject": "\u274c",
-    }
-    emoji = type_emoji.get(comment.get("type", "comment"), "\U0001f4ac")
+    emoji = _TYPE_EMOJI.get(comment.get("type", "comment"), "\U0001f4ac")
     selected_text = comment.get("selectedText", "")
 
-    header = re.escape(f'### {emoji} {comment.get("type", "comment").upper()}')
+    excerpt = section = None
     if selected_text:
         excerpt = selected_text[:80] + ("..." if len(selected_text) > 80 else "")
-        header += re.escape(f' (on: "{excerpt}")')
     elif comment.get("sectionTitle"):
-        header += re.escape(f' (re: "{comment["sectionTitle"]}")')
-    if comment.get("lineNumber"):
-        header += re.escape(f' [Line {comment["lineNumber"]}]')
+        section = str(comment["sectionTitle"])
+    # Fields come straight from the POST body; stringify so they're hashable cache keys
+    line_number = comment.get("lineNumber")
+
+    ts = _iso_to_ts(comment["createdAt"])
+    return _compiled_removal_pattern(
+        emoji,
+        comment.get("type", "comment").upper(),
+        excerpt,
+        section,
+        str(line_number) if line_number else None,
+        comment.get("text", ""),
+        ts,
+    )
+
+
+@functools.lru_cache(maxsize=2048)
+def _compiled_removal_pattern(emoji: str, type_upper: str, excerpt: str | None,
+                              section: str | None, line_number: str | None,
+                              text: str, ts: str) -> re.Pattern:
+    """Compile the removal pattern for one comment block; cached across requests."""
+    header = re.escape(f'### {emoji} {type_upper}')
+    if excerpt is not None:
+        header += re.escape(f' (on: "{excerpt}")')
+    elif section is not None:
+        header += re.escape(f' (re: "{section}")')
+    if line_number:
+        header += re.escape(f' [Line {line_number}]')
 
     # Build quoted text pattern line-by-line, making trailing whitespace optional
     # so "> " (blank quoted line) also matches ">" (no trailing space)
-    text_lines = comment.get("text", "").split("\n")
     quoted_line_patterns = []
-    for line in text_lines:
+    for line in text.split("\n"):
         if line:
             quoted_line_patterns.append(re.escape(f"> {line}") + r" *")
         else:
             quoted_line_patterns.append(r"> ?")
     quoted_escaped = r"\n".join(quoted_line_patterns)
 
-    ts = datetime.fromisoformat(comment["createdAt"]).strftime("%Y/%m/%d %H:%M")
     ts_escaped = re.escape(f"_\u2014 Reviewer, {ts}_")
 
     # Allow 1-2 newlines between heading and quoted text, and between text and timestamp
@@ -395,15 +844,48 @@ def build_comment_removal_pattern(comment: dict) -> re.Pattern:
     )
 
 
+def _write_plan(fp: Path, old: str, new: str, old_size: int, rewrite: bool = False):
+    """Write new plan content, touching only the changed tail when possible.
+
+    Appending a comment block, or removing one that sits at the end of the
+    file, then costs O(block) instead of re-encoding and rewriting the file.
+    Pass rewrite=True when `old` isn't byte-exact with the file (e.g. its
+    newlines were normalized); the offsets would be wrong, so it's rewritten.
+    """
+    if rewrite:
+        fp.write_text(new, encoding="utf-8")
+    elif new.startswith(old):
+        with fp.open("a", encoding="utf-8") as f:
+            f.write(new[len(old):])
+    elif old.startswith(new) and "\ufffd" not in old[len(new):]:
+        # U+FFFD in the dropped tail may stand for undecodable bytes of another length
+        os.truncate(fp, old_size - len(old[len(new):].encode("utf-8")))
+    else:
+        fp.write_text(new, encoding="utf-8")
+
+
 def remove_comment_from_plan(plan_id: str, comment: dict):
     """Remove an injected review comment block from the plan .md file."""
     fp = PLANS_DIR / f"{plan_id}.md"
     if not fp.exists():
         return
 
-    content = fp.read_text(encoding="utf-8", errors="replace")
-    pattern = build_comment_removal_pattern(comment)
-    new_content = pattern.sub("\n\n", content, count=1)
+    content, stat, had_cr = _read_plan(fp)
+
+    # Fast path: the block is usually exactly as build_comment_block() wrote it
+    block = build_comment_block(comment).rstrip("\n")
+    start = content.find(block)
+    if start != -1:
+        end = start + len(block)
+        while start > 0 and content[start - 1] == "\n":
+            start -= 1
+        while end < len(content) and content[end] == "\n":
+            end += 1
+        new_content = content[:start] + "\n\n" + content[end:]
+    else:
+        # Hand-edited block with whitespace variations: fall back to the tolerant regex
+        pattern = build_comment_removal_pattern(comment)
+        new_content = pattern.sub("\n\n", content, count=1)
 
     # Clean up: if the Review Comments section is now empty, remove it too
     review_marker = "## \U0001f4dd Review Comments"
@@ -417,7 +899,7 @@ def remove_comment_from_plan(plan_id: str, comment: dict):
             new_content = before + "\n"
 
     if new_content != content:
-        fp.write_text(new_content, encoding="utf-8")
+        _write_plan(fp, content, new_content, stat.st_size, rewrite=had_cr)
 
 
 def inject_comment_into_plan(plan_id: str, comment: dict):
@@ -432,16 +914,10 @@ def inject_comment_into_plan(plan_id: str, comment: dict):
     if not fp.exists():
         return
 
-    content = fp.read_text(encoding="utf-8", errors="replace")
+    original, stat, had_cr = _read_plan(fp)
+    content = original
 
-    type_emoji = {
-        "comment": "💬",
-        "suggestion": "💡",
-        "question": "❓",
-        "approve": "✅",
-        "reject": "❌",
-    }
-    emoji = type_emoji.get(comment["type"], "💬")
+    emoji = _TYPE_EMOJI.get(comment["type"], "💬")
 
     selected_text = comment.get("selectedText", "")
 
@@ -458,7 +934,7 @@ def inject_comment_into_plan(plan_id: str, comment: dict):
     quoted_text = "\n> ".join(comment["text"].split("\n"))
     block += f"\n\n> {quoted_text}\n\n"
 
-    ts = datetime.fromisoformat(comment["createdAt"]).strftime("%Y/%m/%d %H:%M")
+    ts = _iso_to_ts(comment["createdAt"])
     block += f"_— Reviewer, {ts}_\n\n"
 
     if selected_text:
@@ -490,7 +966,7 @@ def inject_comment_into_plan(plan_id: str, comment: dict):
         else:
             content += f"\n\n---\n\n{review_marker}\n\n{block}"
 
-    fp.write_text(content, encoding="utf-8")
+    _write_plan(fp, original, content, stat.st_size, rewrite=had_cr)
 
 
 # ── Latest Session Info ──────────────────────────────────────
@@ -502,29 +978,56 @@ def get_latest_session() -> dict | None:
 
     latest, latest_time = None, 0.0
     try:
-        for proj_dir in projects_dir.iterdir():
-            if not proj_dir.is_dir():
-                continue
-            for f in proj_dir.iterdir():
-                if f.suffix == ".jsonl":
-                    mt = f.stat().st_mtime
-                    if mt > latest_time:
-                        latest_time = mt
-                        latest = {
-                            "project": proj_dir.name,
-                            "session": f.stem,
-                            "modified": datetime.fromtimestamp(mt, tz=timezone.utc).isoformat(),
-                        }
+        with os.scandir(projects_dir) as projects:
+            for proj_dir in projects:
+                if not proj_dir.is_dir():
+                    continue
+                with os.scandir(proj_dir.path) as sessions:
+                    for f in sessions:
+                        if f.name.endswith(".jsonl"):
+                            mt = f.stat().st_mtime
+                            if mt > latest_time:
+                                latest_time = mt
+                                latest = {
+                                    "project": proj_dir.name,
+                                    "session": f.name[:-len(".jsonl")],
+                                    "modified": datetime.fromtimestamp(mt, tz=timezone.utc).isoformat(),
+                                }
     except OSError:
         pass
     return latest
 
 
+# ── Static Files ─────────────────────────────────────────────
+
+_static_cache: dict[Path, tuple[int, bytes]] = {}
+
+
+def get_static(path: Path) -> bytes | None:
+    """Return a static file's bytes, re-reading it only when its mtime changes."""
+    try:
+        mtime = path.stat().st_mtime_ns
+    except OSError:
+        return None
+    cached = _static_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    try:
+        body = path.read_bytes()
+    except OSError:
+        return None
+    _static_cache[path] = (mtime, body)
+    return body
+
+
 # ── HTTP Handler ─────────────────────────────────────────────
 
 class PlanReviewerHandler(BaseHTTPRequestHandler):
     """Single-class HTTP handler for API + static files + SSE."""
 
+    # Don't let idle or stalled connections hold a pool worker forever
+    timeout = 30
+
     def handle(self):
         try:
             super().handle()
@@ -541,7 +1044,7 @@ class PlanReviewerHandler(BaseHTTPRequestHandler):
     # ── Helpers ──
 
     def send_json(self, data, status=200):
-        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        body = json_bytes(data)
         self.send_response(status)
         self.send_header("Content-Type", "application/json; charset=utf-8")
         self.send_header("Access-Control-Allow-Origin", "*")
@@ -575,6 +1078,8 @@ class PlanReviewerHandler(BaseHTTPRequestHandler):
 
         # SSE endpoint
         if path == "/api/events":
+            # Events are tiny and latency-sensitive; don't let Nagle hold them back
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
             self.send_response(200)
             self.send_header("Content-Type", "text/event-stream")
             self.send_header("Cache-Control", "no-cache")
@@ -583,25 +1088,13 @@ class PlanReviewerHandler(BaseHTTPRequestHandler):
             self.end_headers()
 
             # Send connected event
-            msg = f'event: connected\ndata: {json.dumps({"time": datetime.now(tz=timezone.utc).isoformat()})}\n\n'
-            self.wfile.write(msg.encode())
+            data = json_bytes({"time": datetime.now(tz=timezone.utc).isoformat()})
+            self.wfile.write(b"event: connected\ndata: " + data + b"\n\n")
             self.wfile.flush()
 
-            with sse_lock:
-                sse_clients.append(self.wfile)
-
-            # Keep connection open
-            try:
-                while True:
-                    time.sleep(30)
-                    self.wfile.write(b": keepalive\n\n")
-                    self.wfile.flush()
-            except Exception:
-                pass
-            finally:
-                with sse_lock:
-                    if self.wfile in sse_clients:
-                        sse_clients.remove(self.wfile)
+            # Hand the socket to the SSE reactor; this worker thread is free again
+            self.close_connection = True
+            self.server.hand_off_sse(self.connection)
             return
 
         # API: list plans
@@ -626,8 +1119,8 @@ class PlanReviewerHandler(BaseHTTPRequestHandler):
 
         # Serve frontend
         if path in ("/", "/index.html"):
-            if INDEX_HTML.exists():
-                body = INDEX_HTML.read_bytes()
+            body = get_static(INDEX_HTML)
+            if body is not None:
                 self.send_response(200)
                 self.send_header("Content-Type", "text/html; charset=utf-8")
                 self.send_header("Content-Length", str(len(body)))
@@ -642,9 +1135,8 @@ class PlanReviewerHandler(BaseHTTPRequestHandler):
 
         # Serve icon
         if path == "/icon.svg":
-            icon_path = INDEX_HTML.parent / "icon.svg"
-            if icon_path.exists():
-                body = icon_path.read_bytes()
+            body = get_static(INDEX_HTML.parent / "icon.svg")
+            if body is not None:
                 self.send_response(200)
                 self.send_header("Content-Type", "image/svg+xml")
                 self.send_header("Content-Length", str(len(body)))
@@ -712,9 +1204,72 @@ class PlanReviewerHandler(BaseHTTPRequestHandler):
         self.send_404()
 
 
+# ── HTTP Server ──────────────────────────────────────────────
+
+class PlanReviewerServer(HTTPServer):
+    """HTTPServer that runs requests on a bounded thread pool.
+
+    SSE connections are detached from their worker once the stream is open
+    and kept alive by a single SSEReactor thread, so many open tabs don't
+    each hold a thread.
+    """
+
+    request_queue_size = 32
+
+    def __init__(self, server_address, handler_class, max_workers: int = 32):
+        super().__init__(server_address, handler_class)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="http")
+        # Connections queued or being handled, so server_close() can unblock their workers
+        self._active: set = set()
+        self._active_lock = threading.Lock()
+        self._detached: set = set()
+        self.sse_reactor = SSEReactor()
+        self.sse_reactor.start()
+
+    def hand_off_sse(self, sock: socket.socket):
+        self._detached.add(sock)
+        self.sse_reactor.add_client(sock)
+
+    def process_request(self, request, client_address):
+        with self._active_lock:
+            self._active.add(request)
+        self._executor.submit(self._process_request_worker, request, client_address)
+
+    def _process_request_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def shutdown_request(self, request):
+        with self._active_lock:
+            self._active.discard(request)
+        if request in self._detached:
+            # Now owned by the SSE reactor
+            self._detached.discard(request)
+            return
+        super().shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        # Pool workers are joined at interpreter exit; shut their sockets down so
+        # any worker blocked on a read returns now instead of holding up exit
+        with self._active_lock:
+            active = list(self._active)
+        for sock in active:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self._executor.shutdown(wait=False)
+
+
 # ── Main ─────────────────────────────────────────────────────
 
 def main():
+    global WATCHER
     parser = argparse.ArgumentParser(description="Claude Code Plan Reviewer")
     parser.add_argument("--port", type=int, default=int(os.environ.get("PLAN_REVIEWER_PORT", 3456)))
     args = parser.parse_args()
@@ -723,16 +1278,16 @@ def main():
     PLANS_DIR.mkdir(parents=True, exist_ok=True)
     COMMENTS_DIR.mkdir(parents=True, exist_ok=True)
 
+    def on_file_change(_dir: str, file: str):
+        invalidate_sync_cache(Path(file).stem)
+        _read_plan_cached.cache_clear()
+
     # Start file watcher
-    watcher = FileWatcher([PLANS_DIR, COMMENTS_DIR])
+    watcher = WATCHER = FileWatcher([PLANS_DIR, COMMENTS_DIR], on_change=on_file_change)
     watcher.start()
 
     # Start HTTP server
-    class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
-        daemon_threads = True
-
-    server = ThreadingHTTPServer(("127.0.0.1", args.port), PlanReviewerHandler)
-    server.request_queue_size = 32
+    server = PlanReviewerServer(("127.0.0.1", args.port), PlanReviewerHandler)
 
     print(f"""
 ╔══════════════════════════════════════════════╗
@@ -751,7 +1306,10 @@ def main():
         server.serve_forever()
     except KeyboardInterrupt:
         print("\n👋 Shutting down...")
+        watcher.stop()
+        watcher.join(timeout=2)
         server.shutdown()
+        server.server_close()
 
 
 if __name__ == "__main__":